@@ -19,7 +19,9 @@ use archlens::{
     ensure_absolute_path,
 };
 use regex::Regex;
+use std::borrow::Cow;
 use std::cmp::Reverse;
+use std::sync::LazyLock;
 
 // =============== Types ===============
 #[derive(Debug, Clone, Serialize, Deserialize, JsonSchema)]
@@ -231,18 +233,18 @@ fn clamp_text_with_limit(s: &str, req_limit: Option<usize>) -> String {
     clamp_text(s, eff)
 }
 
+static CODE_BLOCK_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"(?s)```.*?```").unwrap());
+static BLANK_LINES_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\n{3,}").unwrap());
+
 fn strip_code_blocks(md: &str) -> String {
-    let re = Regex::new(r"(?s)```.*?```").ok();
-    let mut out = md.to_string();
-    if let Some(re) = re {
-        out = re.replace_all(&out, "").to_string();
-    }
+    // replace_all borrows the input when nothing matched, so only copy when a pass changed something
+    let out = CODE_BLOCK_RE.replace_all(md, "");
     // compress blank lines
-    let re2 = Regex::new(r"\n{3,}").ok();
-    if let Some(re2) = re2 {
-        out = re2.replace_all(&out, "\n\n").to_string();
-    }
-    out
+    let compressed = match BLANK_LINES_RE.replace_all(&out, "\n\n") {
+        Cow::Owned(compressed) => Some(compressed),
+        Cow::Borrowed(_) => None,
+    };
+    compressed.unwrap_or_else(|| out.into_owned())
 }
 
 fn canonical_section_key(name: &str) -> String {
@@ -651,15 +653,17 @@ fn write_json_line<T: Serialize>(
         result,
         error,
     };
-    let line = serde_json::to_string(&resp).unwrap_or_else(|e| {
+    let mut line = serde_json::to_vec(&resp).unwrap_or_else(|e| {
         format!(
             "{{\"jsonrpc\":\"2.0\",\"id\":null,\"error\":{{\"code\":-32603,\"message\":\"{}\"}}}}",
             e
         )
+        .into_bytes()
     });
-    let mut stdout = io::stdout();
-    let _ = stdout.write_all(line.as_bytes());
-    let _ = stdout.write_all(b"\n");
+    line.push(b'\n');
+    // whole frame in one locked write: a single syscall and no interleaving between responses
+    let mut stdout = io::stdout().lock();
+    let _ = stdout.write_all(&line);
     let _ = stdout.flush();
 }
 
@@ -995,15 +999,16 @@ fn export_cache_key(
 fn cache_get(key: &str, ttl_ms: u64) -> Option<(String, String)> {
     let dir = cache_dir();
     let p = dir.join(format!("{}.json", key));
-    let meta = fs::metadata(&p).ok()?;
+    // one open: age check via fstat, then a single pre-sized read of the raw bytes
+    let mut f = fs::File::open(&p).ok()?;
+    let meta = f.metadata().ok()?;
     let age = meta.modified().ok()?.elapsed().ok()?.as_millis() as u64;
     if age > ttl_ms {
         return None;
     }
-    let mut f = fs::File::open(&p).ok()?;
-    let mut buf = String::new();
-    let _ = f.read_to_string(&mut buf).ok()?;
-    let v: serde_json::Value = serde_json::from_str(&buf).ok()?;
+    let mut buf = Vec::with_capacity(meta.len() as usize);
+    f.read_to_end(&mut buf).ok()?;
+    let v: serde_json::Value = serde_json::from_slice(&buf).ok()?;
     let etag = v.get("etag")?.as_str()?.to_string();
     let output = v.get("output")?.as_str()?.to_string();
     Some((etag, output))
@@ -1038,33 +1043,39 @@ fn write_preset(name: &str, json: serde_json::Value) {
 fn build_graph_for_path(project_path: &str) -> Result<archlens::types::CapsuleGraph, String> {
     use archlens::capsule_constructor::CapsuleConstructor;
     use archlens::capsule_graph_builder::CapsuleGraphBuilder;
-    use archlens::file_scanner::FileScanner;
+    use archlens::file_scanner::{read_sources, FileScanner};
     use archlens::parser_ast::ParserAST;
     use archlens::types::Capsule;
     use archlens::validator_optimizer::ValidatorOptimizer;
     use std::path::Path;
 
-    let scanner = FileScanner::new(
-        vec![
-            "**/*.rs".into(),
-            "**/*.ts".into(),
-            "**/*.js".into(),
-            "**/*.py".into(),
-            "**/*.java".into(),
-            "**/*.go".into(),
-            "**/*.cpp".into(),
-            "**/*.c".into(),
-        ],
-        vec![
-            "**/target/**".into(),
-            "**/node_modules/**".into(),
-            "**/.git/**".into(),
-            "**/dist/**".into(),
-            "**/build/**".into(),
-        ],
-        Some(8),
-    )
-    .map_err(|e| e.to_string())?;
+    // one scanner per server process: its metadata cache lets repeat calls skip
+    // re-extracting metadata for unchanged files (sources are still read and parsed)
+    static SCANNER: LazyLock<Result<FileScanner, String>> = LazyLock::new(|| {
+        FileScanner::new(
+            vec![
+                "**/*.rs".into(),
+                "**/*.ts".into(),
+                "**/*.js".into(),
+                "**/*.py".into(),
+                "**/*.java".into(),
+                "**/*.go".into(),
+                "**/*.cpp".into(),
+                "**/*.c".into(),
+            ],
+            vec![
+                "**/target/**".into(),
+                "**/node_modules/**".into(),
+                "**/.git/**".into(),
+                "**/dist/**".into(),
+                "**/build/**".into(),
+            ],
+            Some(8),
+        )
+        .map(FileScanner::with_metadata_cache)
+        .map_err(|e| e.to_string())
+    });
+    let scanner = SCANNER.as_ref().map_err(|e| e.clone())?;
     let files = scanner
         .scan_files(Path::new(project_path))
         .map_err(|e| e.to_string())?;
@@ -1072,8 +1083,8 @@ fn build_graph_for_path(project_path: &str) -> Result<archlens::types::CapsuleGr
     let mut parser = ParserAST::new().map_err(|e| e.to_string())?;
     let constructor = CapsuleConstructor::new();
     let mut capsules: Vec<Capsule> = Vec::new();
-    for file in &files {
-        if let Ok(content) = std::fs::read_to_string(&file.path) {
+    for (file, content) in read_sources(&files) {
+        if let Some(content) = content {
             if let Ok(nodes) = parser.parse_file(&file.path, &content, &file.file_type) {
                 let mut caps = constructor
                     .create_capsules(&nodes, &file.path.clone())
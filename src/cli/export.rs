@@ -6,7 +6,7 @@ use std::path::Path;
 use crate::capsule_constructor::CapsuleConstructor;
 use crate::capsule_graph_builder::CapsuleGraphBuilder;
 use crate::exporter::Exporter;
-use crate::file_scanner::FileScanner;
+use crate::file_scanner::{read_sources, FileScanner};
 use crate::parser_ast::ParserAST;
 use crate::validator_optimizer::ValidatorOptimizer;
 
@@ -56,8 +56,8 @@ fn generate_ai_compact_from_graph(project_path: &str) -> std::result::Result<Str
 
     let mut parser = ParserAST::new().map_err(|e| e.to_string())?;
     let mut all_nodes = Vec::new();
-    for file in &files {
-        if let Ok(content) = fs::read_to_string(&file.path) {
+    for (file, content) in read_sources(&files) {
+        if let Some(content) = content {
             if let Ok(nodes) = parser.parse_file(&file.path, &content, &file.file_type) {
                 all_nodes.extend(nodes);
             }
@@ -169,7 +169,7 @@ pub fn build_graph_mermaid(project_path: &str) -> std::result::Result<String, St
     use crate::capsule_constructor::CapsuleConstructor;
     use crate::capsule_graph_builder::CapsuleGraphBuilder;
     use crate::exporter::Exporter;
-    use crate::file_scanner::FileScanner;
+    use crate::file_scanner::{read_sources, FileScanner};
     use crate::parser_ast::ParserAST;
     use crate::validator_optimizer::ValidatorOptimizer;
 
@@ -202,8 +202,8 @@ pub fn build_graph_mermaid(project_path: &str) -> std::result::Result<String, St
     let constructor = CapsuleConstructor::new();
     let mut capsules: Vec<Capsule> = Vec::new();
 
-    for file in &files {
-        if let Ok(content) = std::fs::read_to_string(&file.path) {
+    for (file, content) in read_sources(&files) {
+        if let Some(content) = content {
             if let Ok(nodes) = parser.parse_file(&file.path, &content, &file.file_type) {
                 let mut caps = constructor
                     .create_capsules(&nodes, &file.path.clone())
@@ -230,7 +230,7 @@ pub fn build_graph_mermaid(project_path: &str) -> std::result::Result<String, St
 pub fn run_deep_pipeline(project_path: &str) -> std::result::Result<String, String> {
     use crate::capsule_constructor::CapsuleConstructor;
     use crate::capsule_graph_builder::CapsuleGraphBuilder;
-    use crate::file_scanner::FileScanner;
+    use crate::file_scanner::{read_sources, FileScanner};
     use crate::parser_ast::ParserAST;
     use crate::validator_optimizer::ValidatorOptimizer;
 
@@ -263,8 +263,8 @@ pub fn run_deep_pipeline(project_path: &str) -> std::result::Result<String, Stri
     let constructor = CapsuleConstructor::new();
     let mut capsules: Vec<Capsule> = Vec::new();
 
-    for file in &files {
-        if let Ok(content) = std::fs::read_to_string(&file.path) {
+    for (file, content) in read_sources(&files) {
+        if let Some(content) = content {
             if let Ok(nodes) = parser.parse_file(&file.path, &content, &file.file_type) {
                 let mut caps = constructor
                     .create_capsules(&nodes, &file.path.clone())
@@ -1,3 +1,4 @@
+use crate::file_scanner::is_dir_entry;
 use schemars::JsonSchema;
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
@@ -67,7 +68,7 @@ fn scan_directory(
             let entry = entry?;
             let path = entry.path();
 
-            if path.is_dir() {
+            if is_dir_entry(&entry) {
                 if let Some(dir_name) = path.file_name().and_then(|n| n.to_str()) {
                     if !should_skip_directory(dir_name) {
                         scan_directory(&path, file_types, total_files, total_lines)?;
@@ -145,7 +146,7 @@ fn scan_directory_structure(
         let entry = entry?;
         let path = entry.path();
 
-        if path.is_dir() {
+        if is_dir_entry(&entry) {
             if let Some(dir_name) = path.file_name().and_then(|n| n.to_str()) {
                 if !should_skip_directory(dir_name) {
                     scan_directory_structure(
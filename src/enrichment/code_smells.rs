@@ -3,6 +3,24 @@
 use crate::types::*;
 use regex::Regex;
 use std::collections::HashMap;
+use std::sync::LazyLock;
+
+// Паттерны, компилируемые один раз на процесс (а не на каждый вызов детектора)
+static FN_WITH_BODY_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"fn\s+(\w+)\s*\([^)]*\)\s*\{").unwrap());
+static FN_PARAMS_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"fn\s+(\w+)\s*\(([^)]*)\)").unwrap());
+static FN_DECL_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"fn\s+(\w+)\s*\(").unwrap());
+static STRUCT_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"struct\s+(\w+)").unwrap());
+static IMPL_BLOCK_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"impl\s+(\w+)\s*\{").unwrap());
+static CALL_SITE_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\b(\w+)\s*\(").unwrap());
+static MAGIC_NUMBER_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\b(\d{2,})\b").unwrap());
+static EMPTY_CATCH_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"catch\s*\([^)]*\)\s*\{\s*\}").unwrap());
+static LONG_STRING_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r#""([^"]{10,})""#).unwrap());
+static RUST_USE_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"use\s+([^;]+);").unwrap());
+static JS_VAR_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\bvar\s+\w+").unwrap());
+static PY_BARE_EXCEPT_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"except\s*:").unwrap());
 
 /// Обнаружитель запахов кода
 #[derive(Debug, Clone)]
@@ -172,22 +190,24 @@ impl CodeSmellDetector {
         let threshold = rule.threshold.unwrap_or(20.0) as usize;
 
         // Ищем функции и считаем их длину
-        let fn_pattern = Regex::new(r"fn\s+(\w+)\s*\([^)]*\)\s*\{").unwrap();
-
-        for cap in fn_pattern.captures_iter(content) {
+        for cap in FN_WITH_BODY_RE.captures_iter(content) {
             let fn_name = cap.get(1).unwrap().as_str();
-            let fn_start = cap.get(0).unwrap().start();
+            let fn_match = cap.get(0).unwrap();
+            if in_line_comment(content, fn_match.start()) {
+                continue;
+            }
 
-            // Подсчитываем строки функции (упрощенно)
-            let lines_after = content[fn_start..].lines().take(100).count();
+            // Тело функции: от заголовка до парной закрывающей скобки
+            let fn_end = block_end(content, fn_match.end() - 1);
+            let fn_lines = content[fn_match.start()..fn_end].lines().count();
 
-            if lines_after > threshold {
+            if fn_lines > threshold {
                 smells.push(CodeSmell {
                     smell_type: CodeSmellType::LongMethod,
                     severity: rule.severity,
                     description: format!(
                         "Функция '{}' слишком длинная ({} строк)",
-                        fn_name, lines_after
+                        fn_name, fn_lines
                     ),
                     suggestion: format!(
                         "Разбейте функцию '{}' на несколько более мелких функций",
@@ -210,9 +230,7 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
         let threshold = rule.threshold.unwrap_or(4.0) as usize;
 
-        let fn_pattern = Regex::new(r"fn\s+(\w+)\s*\(([^)]*)\)").unwrap();
-
-        for cap in fn_pattern.captures_iter(content) {
+        for cap in FN_PARAMS_RE.captures_iter(content) {
             let fn_name = cap.get(1).unwrap().as_str();
             let params = cap.get(2).unwrap().as_str();
 
@@ -240,17 +258,24 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
         let threshold = rule.threshold.unwrap_or(200.0) as usize;
 
-        let struct_pattern = Regex::new(r"struct\s+(\w+)").unwrap();
-        let _impl_pattern = Regex::new(r"impl\s+(\w+)").unwrap();
+        // Один проход по файлу: имя типа -> заголовок его первого impl блока
+        let mut impl_headers: HashMap<&str, regex::Match> = HashMap::new();
+        for cap in IMPL_BLOCK_RE.captures_iter(content) {
+            if in_line_comment(content, cap.get(0).unwrap().start()) {
+                continue;
+            }
+            impl_headers
+                .entry(cap.get(1).unwrap().as_str())
+                .or_insert(cap.get(0).unwrap());
+        }
 
-        for cap in struct_pattern.captures_iter(content) {
+        for cap in STRUCT_RE.captures_iter(content) {
             let struct_name = cap.get(1).unwrap().as_str();
 
             // Ищем impl блок для этой структуры
-            let impl_regex = Regex::new(&format!(r"impl\s+{}\s*\{{", struct_name)).unwrap();
-            if let Some(impl_match) = impl_regex.find(content) {
-                let impl_content = &content[impl_match.start()..];
-                let impl_lines = impl_content.lines().take(500).count();
+            if let Some(impl_header) = impl_headers.get(struct_name) {
+                let impl_end = block_end(content, impl_header.end() - 1);
+                let impl_lines = content[impl_header.start()..impl_end].lines().count();
 
                 if impl_lines > threshold {
                     smells.push(CodeSmell {
@@ -307,19 +332,23 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
 
         // Ищем функции, которые не используются
-        let fn_pattern = Regex::new(r"fn\s+(\w+)\s*\(").unwrap();
         let mut all_functions = Vec::new();
 
-        for cap in fn_pattern.captures_iter(content) {
+        for cap in FN_DECL_RE.captures_iter(content) {
             let fn_name = cap.get(1).unwrap().as_str();
             if fn_name != "main" && fn_name != "new" && !fn_name.starts_with("test") {
                 all_functions.push(fn_name);
             }
         }
 
+        // Один проход по файлу: имя -> количество вызовов вида `name(`
+        let mut call_counts: HashMap<&str, usize> = HashMap::new();
+        for cap in CALL_SITE_RE.captures_iter(content) {
+            *call_counts.entry(cap.get(1).unwrap().as_str()).or_insert(0) += 1;
+        }
+
         for fn_name in all_functions {
-            let usage_pattern = Regex::new(&format!(r"\b{}\s*\(", fn_name)).unwrap();
-            let usage_count = usage_pattern.find_iter(content).count();
+            let usage_count = call_counts.get(fn_name).copied().unwrap_or(0);
 
             if usage_count <= 1 {
                 // Только объявление
@@ -367,14 +396,12 @@ impl CodeSmellDetector {
         let mut max_nesting = 0;
 
         for (i, line) in content.lines().enumerate() {
-            let trimmed = line.trim();
-
-            if trimmed.contains('{') {
+            if line.contains('{') {
                 nesting_level += 1;
                 max_nesting = max_nesting.max(nesting_level);
             }
 
-            if trimmed.contains('}') {
+            if line.contains('}') {
                 nesting_level = nesting_level.saturating_sub(1);
             }
 
@@ -395,9 +422,7 @@ impl CodeSmellDetector {
 
     fn detect_magic_numbers(&self, content: &str, rule: &SmellRule) -> Result<Vec<CodeSmell>> {
         let mut smells = Vec::new();
-        let magic_pattern = Regex::new(r"\b(\d{2,})\b").unwrap();
-
-        for cap in magic_pattern.captures_iter(content) {
+        for cap in MAGIC_NUMBER_RE.captures_iter(content) {
             let number = cap.get(1).unwrap().as_str();
             if number != "0" && number != "1" && number != "100" {
                 smells.push(CodeSmell {
@@ -420,9 +445,7 @@ impl CodeSmellDetector {
         rule: &SmellRule,
     ) -> Result<Vec<CodeSmell>> {
         let mut smells = Vec::new();
-        let empty_catch_pattern = Regex::new(r"catch\s*\([^)]*\)\s*\{\s*\}").unwrap();
-
-        for _cap in empty_catch_pattern.captures_iter(content) {
+        for _cap in EMPTY_CATCH_RE.captures_iter(content) {
             smells.push(CodeSmell {
                 smell_type: CodeSmellType::EmptyExceptionHandling,
                 severity: rule.severity,
@@ -493,9 +516,16 @@ impl CodeSmellDetector {
 
     fn detect_hardcoded_values(&self, content: &str, rule: &SmellRule) -> Result<Vec<CodeSmell>> {
         let mut smells = Vec::new();
-        let string_pattern = Regex::new(r#""([^"]{10,})""#).unwrap();
 
-        for cap in string_pattern.captures_iter(content) {
+        // Без URL/localhost в файле ни одна строка не подойдёт - не перебираем все литералы
+        if !content.contains("http://")
+            && !content.contains("https://")
+            && !content.contains("localhost")
+        {
+            return Ok(smells);
+        }
+
+        for cap in LONG_STRING_RE.captures_iter(content) {
             let value = cap.get(1).unwrap().as_str();
             if value.contains("http://")
                 || value.contains("https://")
@@ -542,8 +572,7 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
 
         // Неиспользуемые импорты
-        let unused_import_pattern = Regex::new(r"use\s+([^;]+);").unwrap();
-        for cap in unused_import_pattern.captures_iter(content) {
+        for cap in RUST_USE_RE.captures_iter(content) {
             let import = cap.get(1).unwrap().as_str();
             let import_name = import.split("::").last().unwrap_or(import);
 
@@ -568,8 +597,7 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
 
         // Использование var вместо let/const
-        let var_pattern = Regex::new(r"\bvar\s+\w+").unwrap();
-        for _cap in var_pattern.captures_iter(content) {
+        for _cap in JS_VAR_RE.captures_iter(content) {
             smells.push(CodeSmell {
                 smell_type: CodeSmellType::PrimitiveObsession,
                 severity: Priority::Medium,
@@ -587,8 +615,7 @@ impl CodeSmellDetector {
         let mut smells = Vec::new();
 
         // Bare except
-        let bare_except_pattern = Regex::new(r"except\s*:").unwrap();
-        for _cap in bare_except_pattern.captures_iter(content) {
+        for _cap in PY_BARE_EXCEPT_RE.captures_iter(content) {
             smells.push(CodeSmell {
                 smell_type: CodeSmellType::EmptyExceptionHandling,
                 severity: Priority::High,
@@ -679,3 +706,226 @@ impl Default for CodeSmellDetector {
         Self::new()
     }
 }
+
+/// Возвращает позицию сразу после `}`, парной к `{` на позиции `open`.
+/// Скобки внутри строковых и символьных литералов и комментариев не считаются;
+/// незакрытый блок тянется до конца файла. Вложенные `/* */` не поддерживаются.
+fn block_end(content: &str, open: usize) -> usize {
+    let bytes = content.as_bytes();
+    let mut depth = 0usize;
+    let mut pos = open;
+
+    // Переходим сразу к следующему значимому символу, не разбирая остальной код
+    while let Some(offset) = bytes[pos..]
+        .iter()
+        .position(|b| matches!(b, b'{' | b'}' | b'"' | b'\'' | b'/'))
+    {
+        let at = pos + offset;
+        pos = match bytes[at] {
+            b'{' => {
+                depth += 1;
+                at + 1
+            }
+            b'}' => {
+                depth -= 1;
+                if depth == 0 {
+                    return at + 1;
+                }
+                at + 1
+            }
+            b'"' => string_literal_end(bytes, at),
+            b'\'' => char_literal_end(bytes, at).unwrap_or(at + 1),
+            _ => match bytes.get(at + 1) {
+                Some(b'/') => find_from(bytes, at, b"\n").unwrap_or(bytes.len()),
+                Some(b'*') => find_from(bytes, at + 2, b"*/").map_or(bytes.len(), |end| end + 2),
+                _ => at + 1,
+            },
+        };
+    }
+
+    content.len()
+}
+
+/// Находится ли позиция внутри `//`-комментария (например, пример кода в документации)
+fn in_line_comment(content: &str, pos: usize) -> bool {
+    let line_start = content[..pos].rfind('\n').map_or(0, |nl| nl + 1);
+    content[line_start..pos].contains("//")
+}
+
+/// Позиция после строкового литерала, открытого кавычкой `quote`.
+/// Сырые строки (`r"…"`, `r#"…"#`, `br"…"`) завершаются кавычкой с тем же числом `#`.
+fn string_literal_end(bytes: &[u8], quote: usize) -> usize {
+    let mut start = quote;
+    while start > 0 && bytes[start - 1] == b'#' {
+        start -= 1;
+    }
+    let is_ident = |b: u8| b.is_ascii_alphanumeric() || b == b'_';
+    let raw = start > 0
+        && bytes[start - 1] == b'r'
+        && (start < 2
+            || !is_ident(bytes[start - 2])
+            || (bytes[start - 2] == b'b' && (start < 3 || !is_ident(bytes[start - 3]))));
+
+    if raw {
+        let mut closing = vec![b'"'];
+        closing.resize(quote - start + 1, b'#');
+        return find_from(bytes, quote + 1, &closing)
+            .map_or(bytes.len(), |end| end + closing.len());
+    }
+
+    let mut pos = quote + 1;
+    while pos < bytes.len() {
+        match bytes[pos] {
+            b'\\' => pos += 2,
+            b'"' => return pos + 1,
+            _ => pos += 1,
+        }
+    }
+    bytes.len()
+}
+
+/// Позиция после символьного литерала (`'{'`, `'\n'`, `'я'`) или `None`,
+/// если апостроф открывает время жизни (`'a`, `'static`)
+fn char_literal_end(bytes: &[u8], quote: usize) -> Option<usize> {
+    match *bytes.get(quote + 1)? {
+        // Экранированный символ: закрывающий апостроф ищем после `\x`
+        b'\\' => find_from(bytes, quote + 3, b"'").map(|end| end + 1),
+        first => {
+            let width = match first {
+                0x00..=0x7f => 1,
+                0xc0..=0xdf => 2,
+                0xe0..=0xef => 3,
+                _ => 4,
+            };
+            let end = quote + 1 + width;
+            (bytes.get(end) == Some(&b'\'')).then_some(end + 1)
+        }
+    }
+}
+
+/// Первое вхождение `needle` в `bytes`, начиная с позиции `from`
+fn find_from(bytes: &[u8], from: usize, needle: &[u8]) -> Option<usize> {
+    bytes
+        .get(from..)?
+        .windows(needle.len())
+        .position(|window| window == needle)
+        .map(|offset| from + offset)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn rule(threshold: Option<f32>) -> SmellRule {
+        SmellRule {
+            name: "test".to_string(),
+            pattern: Regex::new(r"fn\s+\w+").unwrap(),
+            threshold,
+            severity: Priority::Medium,
+            description: String::new(),
+            suggestion: String::new(),
+        }
+    }
+
+    /// Места (`location`) найденных запахов
+    fn locations(smells: Vec<CodeSmell>) -> Vec<String> {
+        smells
+            .into_iter()
+            .filter_map(|smell| smell.location)
+            .collect()
+    }
+
+    #[test]
+    fn dead_code_and_large_classes_match_whole_names() {
+        let detector = CodeSmellDetector::new();
+        let dead = |code: &str| locations(detector.detect_dead_code(code, &rule(None)).unwrap());
+
+        // Вложенный вызов `bar(foo(..))` считается использованием foo
+        assert_eq!(
+            dead("fn foo() {}\nfn run() { bar(foo(1)); }"),
+            vec!["Функция: run"]
+        );
+        // `xfoo(` — не вызов foo
+        assert_eq!(
+            dead("fn foo() {}\nfn xfoo() {}\nfn run() { xfoo(); }"),
+            vec!["Функция: foo", "Функция: run"]
+        );
+        // Пробел перед скобкой не мешает
+        assert_eq!(
+            dead("fn foo() {}\nfn run() { foo (); }"),
+            vec!["Функция: run"]
+        );
+
+        // `impl FooBar {` не относится к `struct Foo`
+        let body = "    fn m() {}\n".repeat(5);
+        let large = |code: &str| {
+            locations(
+                detector
+                    .detect_large_classes(code, &rule(Some(3.0)))
+                    .unwrap(),
+            )
+        };
+        assert!(large(&format!("struct Foo;\nimpl FooBar {{\n{}}}\n", body)).is_empty());
+        assert_eq!(
+            large(&format!(
+                "struct Foo;\nstruct FooBar;\nimpl FooBar {{\n{}}}\n",
+                body
+            )),
+            vec!["Структура: FooBar"]
+        );
+        assert_eq!(
+            large(&format!(
+                "struct Foo;\nimpl Foo {{\n{}}}\nimpl FooBar {{}}\n",
+                body
+            )),
+            vec!["Структура: Foo"]
+        );
+    }
+
+    /// Текст блока от первой `{` в `code` до парной ей `}`
+    fn block(code: &str) -> &str {
+        let open = code.find('{').unwrap();
+        &code[open..block_end(code, open)]
+    }
+
+    #[test]
+    fn block_end_balances_nested_blocks() {
+        let code = "fn a() { if x { loop { y(); } } } fn b() {}";
+        assert_eq!(block(code), "{ if x { loop { y(); } } }");
+    }
+
+    #[test]
+    fn block_end_runs_to_eof_when_unclosed() {
+        let code = "fn a() { if x { y(); }";
+        assert_eq!(block_end(code, code.find('{').unwrap()), code.len());
+    }
+
+    #[test]
+    fn block_end_ignores_braces_in_literals_and_comments() {
+        assert_eq!(
+            block(r#"fn a() { let s = "}{\"}"; } x"#),
+            r#"{ let s = "}{\"}"; }"#
+        );
+        assert_eq!(
+            block("fn a() { let c = '{'; let d = '}'; } x"),
+            "{ let c = '{'; let d = '}'; }"
+        );
+        assert_eq!(
+            block("fn a() { let e = '\\''; f('{'); } x"),
+            "{ let e = '\\''; f('{'); }"
+        );
+        assert_eq!(block("fn a() { // }\n} x"), "{ // }\n}");
+        assert_eq!(block("fn a() { /* } */ } x"), "{ /* } */ }");
+        assert_eq!(block("fn a() { r#\"}\"# } x"), "{ r#\"}\"# }");
+        // Время жизни не открывает символьный литерал
+        assert_eq!(block("fn a<'a>(v: &'a str) { '}' } x"), "{ '}' }");
+    }
+
+    #[test]
+    fn headers_inside_line_comments_are_detected() {
+        let code = "//! let s = \"fn hello() { x }\";\nfn real() {}\n    /// impl Foo {\n";
+        assert!(in_line_comment(code, code.find("fn hello").unwrap()));
+        assert!(!in_line_comment(code, code.find("fn real").unwrap()));
+        assert!(in_line_comment(code, code.find("impl Foo").unwrap()));
+    }
+}
@@ -4,6 +4,36 @@ use crate::types::*;
 use regex::Regex;
 use std::collections::HashMap;
 use std::path::Path;
+use std::sync::LazyLock;
+
+// Паттерны, компилируемые один раз на процесс (а не на каждый вызов анализа)
+static RUST_TEST_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"#\[test\]\s*fn\s+(\w+)").unwrap());
+static RUST_BENCH_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"#\[bench\]\s*fn\s+(\w+)").unwrap());
+static JS_TEST_CALL_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(test|it|describe)\s*\(\s*[^\(\)]*").unwrap());
+static PY_TEST_FN_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"def\s+(test_\w+)").unwrap());
+static PY_TEST_CLASS_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"class\s+(\w*Test\w*)\s*\(").unwrap());
+static JS_DOC_BLOCK_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"/\*\*[\s\S]*?\*/").unwrap());
+static PY_DOCSTRING_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r#""""[\s\S]*?"""#).unwrap());
+static RUST_FN_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"fn\s+\w+").unwrap());
+static JS_FN_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(r"function\s+\w+|const\s+\w+\s*=\s*\(|let\s+\w+\s*=\s*\(").unwrap()
+});
+static PY_FN_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"def\s+\w+").unwrap());
+static RUST_TYPE_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"struct\s+\w+|enum\s+\w+|trait\s+\w+").unwrap());
+static CLASS_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"class\s+\w+").unwrap());
+// Ключевые слова ветвления: одна альтернация на язык вместо прохода на каждое слово
+static RUST_COMPLEXITY_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"\b(?:if|else|for|while|match|loop)\b").unwrap());
+static JS_COMPLEXITY_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"\b(?:if|else|for|while|switch|try|catch)\b").unwrap());
+static PY_COMPLEXITY_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"\b(?:if|elif|else|for|while|try|except|with)\b").unwrap());
 
 /// Анализатор содержимого файлов
 pub struct ContentAnalyzer {
@@ -93,40 +123,40 @@ impl ContentAnalyzer {
 
         match file_type {
             FileType::Rust => {
-                let test_pattern = Regex::new(r"#\[test\]\s*fn\s+(\w+)").unwrap();
-                for cap in test_pattern.captures_iter(content) {
+                for cap in RUST_TEST_FN_RE.captures_iter(content) {
                     if let Some(test_name) = cap.get(1) {
                         indicators.push(format!("Тест: {}", test_name.as_str()));
                     }
                 }
 
-                let bench_pattern = Regex::new(r"#\[bench\]\s*fn\s+(\w+)").unwrap();
-                for cap in bench_pattern.captures_iter(content) {
+                for cap in RUST_BENCH_FN_RE.captures_iter(content) {
                     if let Some(bench_name) = cap.get(1) {
                         indicators.push(format!("Бенчмарк: {}", bench_name.as_str()));
                     }
                 }
             }
             FileType::JavaScript | FileType::TypeScript => {
-                let test_pattern = Regex::new(r"(test|it|describe)\s*\(\s*[^\(\)]*").unwrap();
-                for cap in test_pattern.captures_iter(content) {
+                for cap in JS_TEST_CALL_RE.captures_iter(content) {
                     if cap.len() > 1 {
                         indicators.push(format!("Тест: {}", cap.get(1).unwrap().as_str()));
                     }
                 }
             }
             FileType::Python => {
-                let test_pattern = Regex::new(r"def\s+(test_\w+)").unwrap();
-                for cap in test_pattern.captures_iter(content) {
-                    if let Some(test_name) = cap.get(1) {
-                        indicators.push(format!("Тест: {}", test_name.as_str()));
+                // Дешёвая проверка подстроки: без неё regex перебирает каждый def/class
+                if content.contains("test_") {
+                    for cap in PY_TEST_FN_RE.captures_iter(content) {
+                        if let Some(test_name) = cap.get(1) {
+                            indicators.push(format!("Тест: {}", test_name.as_str()));
+                        }
                     }
                 }
 
-                let unittest_pattern = Regex::new(r"class\s+(\w*Test\w*)\s*\(").unwrap();
-                for cap in unittest_pattern.captures_iter(content) {
-                    if let Some(test_class) = cap.get(1) {
-                        indicators.push(format!("Тест-класс: {}", test_class.as_str()));
+                if content.contains("Test") {
+                    for cap in PY_TEST_CLASS_RE.captures_iter(content) {
+                        if let Some(test_class) = cap.get(1) {
+                            indicators.push(format!("Тест-класс: {}", test_class.as_str()));
+                        }
                     }
                 }
             }
@@ -179,20 +209,14 @@ impl ContentAnalyzer {
                 .lines()
                 .filter(|line| line.trim().starts_with("///") || line.trim().starts_with("//!"))
                 .count() as f32,
-            FileType::JavaScript | FileType::TypeScript => {
-                let doc_pattern = Regex::new(r"/\*\*[\s\S]*?\*/").unwrap();
-                doc_pattern
-                    .find_iter(content)
-                    .map(|m| m.as_str().lines().count())
-                    .sum::<usize>() as f32
-            }
-            FileType::Python => {
-                let doc_pattern = Regex::new(r#""""[\s\S]*?"""#).unwrap();
-                doc_pattern
-                    .find_iter(content)
-                    .map(|m| m.as_str().lines().count())
-                    .sum::<usize>() as f32
-            }
+            FileType::JavaScript | FileType::TypeScript => JS_DOC_BLOCK_RE
+                .find_iter(content)
+                .map(|m| m.as_str().lines().count())
+                .sum::<usize>() as f32,
+            FileType::Python => PY_DOCSTRING_RE
+                .find_iter(content)
+                .map(|m| m.as_str().lines().count())
+                .sum::<usize>() as f32,
             _ => 0.0,
         };
 
@@ -225,23 +249,15 @@ impl ContentAnalyzer {
     }
 
     fn calculate_complexity_factor(&self, content: &str, file_type: &FileType) -> f32 {
-        let complexity_keywords = match file_type {
-            FileType::Rust => vec!["if", "else", "for", "while", "match", "loop"],
+        let complexity_count = match file_type {
+            FileType::Rust => RUST_COMPLEXITY_RE.find_iter(content).count(),
             FileType::JavaScript | FileType::TypeScript => {
-                vec!["if", "else", "for", "while", "switch", "try", "catch"]
+                JS_COMPLEXITY_RE.find_iter(content).count()
             }
-            FileType::Python => vec![
-                "if", "elif", "else", "for", "while", "try", "except", "with",
-            ],
-            _ => vec![],
+            FileType::Python => PY_COMPLEXITY_RE.find_iter(content).count(),
+            _ => 0,
         };
 
-        let mut complexity_count = 0;
-        for keyword in complexity_keywords {
-            let pattern = Regex::new(&format!(r"\b{}\b", keyword)).unwrap();
-            complexity_count += pattern.find_iter(content).count();
-        }
-
         let total_lines = content.lines().count();
         if total_lines == 0 {
             return 1.0;
@@ -297,36 +313,18 @@ impl ContentAnalyzer {
 
     fn count_functions(&self, content: &str, file_type: &FileType) -> usize {
         match file_type {
-            FileType::Rust => {
-                let pattern = Regex::new(r"fn\s+\w+").unwrap();
-                pattern.find_iter(content).count()
-            }
-            FileType::JavaScript | FileType::TypeScript => {
-                let pattern =
-                    Regex::new(r"function\s+\w+|const\s+\w+\s*=\s*\(|let\s+\w+\s*=\s*\(").unwrap();
-                pattern.find_iter(content).count()
-            }
-            FileType::Python => {
-                let pattern = Regex::new(r"def\s+\w+").unwrap();
-                pattern.find_iter(content).count()
-            }
+            FileType::Rust => RUST_FN_RE.find_iter(content).count(),
+            FileType::JavaScript | FileType::TypeScript => JS_FN_RE.find_iter(content).count(),
+            FileType::Python => PY_FN_RE.find_iter(content).count(),
             _ => 0,
         }
     }
 
     fn count_classes(&self, content: &str, file_type: &FileType) -> usize {
         match file_type {
-            FileType::Rust => {
-                let pattern = Regex::new(r"struct\s+\w+|enum\s+\w+|trait\s+\w+").unwrap();
-                pattern.find_iter(content).count()
-            }
-            FileType::JavaScript | FileType::TypeScript => {
-                let pattern = Regex::new(r"class\s+\w+").unwrap();
-                pattern.find_iter(content).count()
-            }
-            FileType::Python => {
-                let pattern = Regex::new(r"class\s+\w+").unwrap();
-                pattern.find_iter(content).count()
+            FileType::Rust => RUST_TYPE_RE.find_iter(content).count(),
+            FileType::JavaScript | FileType::TypeScript | FileType::Python => {
+                CLASS_RE.find_iter(content).count()
             }
             _ => 0,
         }
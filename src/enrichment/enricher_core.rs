@@ -1,4 +1,5 @@
 // Core enrichment logic for capsules
+use crate::enrichment::quality_metrics::has_duplicated_block;
 use crate::types::*;
 use regex::Regex;
 use std::collections::{HashMap, HashSet};
@@ -12,6 +13,19 @@ pub struct CapsuleEnricher {
     pub analysis_cache: HashMap<String, EnrichmentResult>,
 }
 
+/// File-level facts shared by every capsule from the same source file
+struct ContentFacts {
+    line_count: usize,
+    summary: Option<String>,
+    has_doc_comments: bool,
+    has_tests: bool,
+    has_documentation: bool,
+    has_duplication: bool,
+    quality_score: f32,
+    external_dependencies: Option<String>,
+    public_exports: Option<String>,
+}
+
 /// Result of capsule enrichment
 #[derive(Debug, Clone)]
 pub struct EnrichmentResult {
@@ -161,16 +175,23 @@ impl CapsuleEnricher {
     pub fn enrich_graph(&self, graph: &CapsuleGraph) -> Result<CapsuleGraph> {
         let mut enriched_capsules = HashMap::new();
         let mut enriched_relations = graph.relations.clone();
+        // Read and analyze each source file once; capsules from the same file share the result
+        let mut file_facts: HashMap<&Path, Option<ContentFacts>> = HashMap::new();
 
         for (id, capsule) in &graph.capsules {
             let mut enriched_capsule = capsule.clone();
 
+            let facts = file_facts
+                .entry(capsule.file_path.as_path())
+                .or_insert_with(|| {
+                    let content = std::fs::read_to_string(&capsule.file_path).ok()?;
+                    Some(self.analyze_content(&content, &capsule.file_path))
+                });
+
             // Enrich metadata from file content
-            if let Ok(content) = std::fs::read_to_string(&capsule.file_path) {
-                self.enrich_capsule_metadata(&mut enriched_capsule, &content)?;
-                self.analyze_dependencies(&mut enriched_capsule, &content)?;
-                self.extract_exports(&mut enriched_capsule, &content)?;
-                self.generate_warnings(&mut enriched_capsule, &content)?;
+            if let Some(facts) = facts {
+                self.enrich_capsule_metadata(&mut enriched_capsule, facts)?;
+                self.generate_warnings(&mut enriched_capsule, facts)?;
             }
 
             enriched_capsules.insert(*id, enriched_capsule);
@@ -189,16 +210,42 @@ impl CapsuleEnricher {
         })
     }
 
-    /// Enrich capsule metadata from content
-    fn enrich_capsule_metadata(&self, capsule: &mut Capsule, content: &str) -> Result<()> {
+    /// Compute the file-level facts used by metadata enrichment and warnings
+    fn analyze_content(&self, content: &str, file_path: &Path) -> ContentFacts {
         // Extract comments and documentation
-        let doc_comments = self.extract_documentation(content, &capsule.file_path);
-        if let Some(doc) = doc_comments.first() {
+        let doc_comments = self.extract_documentation(content, file_path);
+        let has_doc_comments = !doc_comments.is_empty();
+
+        let has_tests = self.has_tests(content);
+        let has_documentation = self.has_documentation(content);
+        let has_duplication = has_duplicated_block(content);
+
+        ContentFacts {
+            line_count: content.lines().count(),
+            summary: doc_comments.into_iter().next(),
+            has_doc_comments,
+            has_tests,
+            has_documentation,
+            has_duplication,
+            quality_score: self.calculate_code_quality(
+                content,
+                has_documentation,
+                has_tests,
+                has_duplication,
+            ),
+            external_dependencies: self.analyze_dependencies(content, file_path),
+            public_exports: self.extract_exports(content, file_path),
+        }
+    }
+
+    /// Enrich capsule metadata from content
+    fn enrich_capsule_metadata(&self, capsule: &mut Capsule, facts: &ContentFacts) -> Result<()> {
+        if let Some(doc) = &facts.summary {
             capsule.summary = Some(doc.clone());
         }
 
         // Update line count
-        let actual_lines = content.lines().count();
+        let actual_lines = facts.line_count;
         if actual_lines != capsule.line_end {
             capsule.line_end = actual_lines;
         }
@@ -209,76 +256,70 @@ impl CapsuleEnricher {
             .insert("actual_lines".to_string(), actual_lines.to_string());
         capsule
             .metadata
-            .insert("has_tests".to_string(), self.has_tests(content).to_string());
+            .insert("has_tests".to_string(), facts.has_tests.to_string());
         capsule.metadata.insert(
             "has_documentation".to_string(),
-            (!doc_comments.is_empty()).to_string(),
+            facts.has_doc_comments.to_string(),
         );
 
         // Code quality analysis
-        let code_quality_score = self.calculate_code_quality(content);
         capsule
             .metadata
-            .insert("quality_score".to_string(), code_quality_score.to_string());
+            .insert("quality_score".to_string(), facts.quality_score.to_string());
+
+        if let Some(dependencies) = &facts.external_dependencies {
+            capsule
+                .metadata
+                .insert("external_dependencies".to_string(), dependencies.clone());
+        }
+        if let Some(exports) = &facts.public_exports {
+            capsule
+                .metadata
+                .insert("public_exports".to_string(), exports.clone());
+        }
 
         Ok(())
     }
 
     /// Analyze dependencies in capsule content
-    fn analyze_dependencies(&self, capsule: &mut Capsule, content: &str) -> Result<()> {
-        let file_type = self.determine_file_type(&capsule.file_path);
+    fn analyze_dependencies(&self, content: &str, file_path: &Path) -> Option<String> {
+        let file_type = self.determine_file_type(file_path);
+        let pattern = self.import_patterns.get(&file_type)?;
 
-        if let Some(pattern) = self.import_patterns.get(&file_type) {
-            let mut dependencies = HashSet::new();
+        // Borrowed slices of the content: no per-dependency allocation before the join
+        let mut dependencies: HashSet<&str> = HashSet::new();
 
-            for capture in pattern.captures_iter(content) {
-                if let Some(dep) = capture.get(1).or_else(|| capture.get(2)) {
-                    let dep_str = dep.as_str().trim();
-                    dependencies.insert(dep_str.to_string());
-                }
+        for capture in pattern.captures_iter(content) {
+            if let Some(dep) = capture.get(1).or_else(|| capture.get(2)) {
+                dependencies.insert(dep.as_str().trim());
             }
-
-            capsule.metadata.insert(
-                "external_dependencies".to_string(),
-                dependencies.into_iter().collect::<Vec<_>>().join(", "),
-            );
         }
 
-        Ok(())
+        Some(dependencies.into_iter().collect::<Vec<_>>().join(", "))
     }
 
     /// Extract exports from capsule content
-    fn extract_exports(&self, capsule: &mut Capsule, content: &str) -> Result<()> {
-        let file_type = self.determine_file_type(&capsule.file_path);
-
-        if let Some(pattern) = self.export_patterns.get(&file_type) {
-            let mut exports = Vec::new();
-
-            for capture in pattern.captures_iter(content) {
-                if let Some(export_name) = capture.get(2) {
-                    exports.push(export_name.as_str().to_string());
-                }
-            }
-
-            capsule
-                .metadata
-                .insert("public_exports".to_string(), exports.join(", "));
-        }
+    fn extract_exports(&self, content: &str, file_path: &Path) -> Option<String> {
+        let file_type = self.determine_file_type(file_path);
+        let pattern = self.export_patterns.get(&file_type)?;
+
+        let exports: Vec<&str> = pattern
+            .captures_iter(content)
+            .filter_map(|capture| capture.get(2))
+            .map(|export_name| export_name.as_str())
+            .collect();
 
-        Ok(())
+        Some(exports.join(", "))
     }
 
     /// Generate warnings for capsule
-    fn generate_warnings(&self, capsule: &mut Capsule, content: &str) -> Result<()> {
+    fn generate_warnings(&self, capsule: &mut Capsule, facts: &ContentFacts) -> Result<()> {
         let mut warnings = Vec::new();
 
         // Generate warnings for long methods
-        if content.lines().count() > 50 {
+        if facts.line_count > 50 {
             warnings.push(AnalysisWarning {
-                message: format!(
-                    "Method/function is too long ({} lines)",
-                    content.lines().count()
-                ),
+                message: format!("Method/function is too long ({} lines)", facts.line_count),
                 level: Priority::Medium,
                 category: "code_quality".to_string(),
                 capsule_id: None,
@@ -289,7 +330,7 @@ impl CapsuleEnricher {
         }
 
         // Generate warnings for code duplication
-        if self.has_code_duplication(content) {
+        if facts.has_duplication {
             warnings.push(AnalysisWarning {
                 message: "Potential code duplication detected".to_string(),
                 level: Priority::High,
@@ -300,7 +341,7 @@ impl CapsuleEnricher {
         }
 
         // Generate warnings for missing documentation
-        if !self.has_documentation(content) {
+        if !facts.has_documentation {
             warnings.push(AnalysisWarning {
                 message: "Missing documentation".to_string(),
                 level: Priority::Low,
@@ -429,7 +470,13 @@ impl CapsuleEnricher {
     }
 
     /// Calculate code quality score
-    fn calculate_code_quality(&self, content: &str) -> f32 {
+    fn calculate_code_quality(
+        &self,
+        content: &str,
+        has_documentation: bool,
+        has_tests: bool,
+        has_duplication: bool,
+    ) -> f32 {
         let mut score: f32 = 50.0; // Base score
 
         // Function count analysis
@@ -443,45 +490,23 @@ impl CapsuleEnricher {
         }
 
         // Documentation bonus
-        if self.has_documentation(content) {
+        if has_documentation {
             score += 15.0;
         }
 
         // Test bonus
-        if self.has_tests(content) {
+        if has_tests {
             score += 20.0;
         }
 
         // Penalty for code duplication
-        if self.has_code_duplication(content) {
+        if has_duplication {
             score -= 20.0;
         }
 
         score.clamp(0.0, 100.0)
     }
 
-    /// Check for code duplication
-    fn has_code_duplication(&self, content: &str) -> bool {
-        let lines: Vec<&str> = content
-            .lines()
-            .map(|line| line.trim())
-            .filter(|line| !line.is_empty() && !line.starts_with("//") && !line.starts_with("#"))
-            .collect();
-
-        // Simple check for repeating blocks of 3+ lines
-        for i in 0..lines.len().saturating_sub(3) {
-            let block = &lines[i..i + 3];
-            for j in (i + 3)..lines.len().saturating_sub(3) {
-                let other_block = &lines[j..j + 3];
-                if block == other_block {
-                    return true;
-                }
-            }
-        }
-
-        false
-    }
-
     /// Determine file type by extension
     fn determine_file_type(&self, path: &Path) -> FileType {
         match path.extension().and_then(|ext| ext.to_str()) {
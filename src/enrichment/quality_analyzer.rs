@@ -1,6 +1,13 @@
 // Quality analysis module for code assessment
+use crate::enrichment::quality_metrics::has_duplicated_block;
 use crate::types::*;
+use regex::Regex;
 use std::collections::HashMap;
+use std::sync::LazyLock;
+
+// Numeric literals of 2+ digits; group 2 captures the number itself
+static MAGIC_NUMBER_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(^|[^A-Za-z0-9_.])([0-9]{2,})([^A-Za-z0-9_.]|$)").unwrap());
 
 /// Quality analyzer for code assessment
 #[derive(Debug)]
@@ -330,7 +337,7 @@ impl QualityAnalyzer {
         score -= (content.matches("XXX").count() as f32) * 4.0;
 
         // Penalize code duplication
-        if self.has_code_duplication(content) {
+        if has_duplicated_block(content) {
             score -= 15.0;
         }
 
@@ -524,13 +531,8 @@ impl QualityAnalyzer {
 
     fn has_magic_numbers(&self, content: &str) -> bool {
         // Look for numeric literals that might be magic numbers
-        use regex::Regex;
-        // Упростим: числа из 2+ цифр, выделяем вторую группу как само число
-        let magic_number_regex =
-            Regex::new(r"(^|[^A-Za-z0-9_.])([0-9]{2,})([^A-Za-z0-9_.]|$)").unwrap();
-
         // Ignore common non-magic numbers
-        let magic_numbers: Vec<String> = magic_number_regex
+        let magic_numbers: Vec<String> = MAGIC_NUMBER_RE
             .captures_iter(content)
             .filter_map(|cap| cap.get(2))
             .map(|m| m.as_str().to_string())
@@ -542,27 +544,6 @@ impl QualityAnalyzer {
 
         magic_numbers.len() > 3
     }
-
-    fn has_code_duplication(&self, content: &str) -> bool {
-        let lines: Vec<&str> = content
-            .lines()
-            .map(|line| line.trim())
-            .filter(|line| !line.is_empty() && !line.starts_with("//") && !line.starts_with("#"))
-            .collect();
-
-        // Check for repeating blocks of 3+ lines
-        for i in 0..lines.len().saturating_sub(3) {
-            let block = &lines[i..i + 3];
-            for j in (i + 3)..lines.len().saturating_sub(3) {
-                let other_block = &lines[j..j + 3];
-                if block == other_block {
-                    return true;
-                }
-            }
-        }
-
-        false
-    }
 }
 
 impl Default for ComplexityThresholds {
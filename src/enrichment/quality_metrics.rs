@@ -4,6 +4,23 @@ use crate::enrichment::semantic_analysis::SemanticLink;
 use crate::types::*;
 use regex::Regex;
 use std::collections::HashMap;
+use std::sync::LazyLock;
+
+// Паттерны, компилируемые один раз на процесс (а не на каждый вызов анализа)
+static RUST_FN_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"fn\s+\w+").unwrap());
+static JS_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"function\s+\w+|const\s+\w+\s*=\s*\(").unwrap());
+static PY_FN_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"def\s+\w+").unwrap());
+static RUST_DOC_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"///.*\n\s*fn\s+\w+").unwrap());
+static JS_DOC_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"/\*\*.*?\*/\s*function\s+\w+").unwrap());
+static PY_DOC_FN_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r#"def\s+\w+[^:]*:\s*""".*?""""#).unwrap());
+static TODO_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(?i)(TODO|FIXME|HACK|XXX|BUG)").unwrap());
+static LONG_PARAM_LIST_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"fn\s+\w+\s*\([^)]{50,}\)").unwrap());
 
 /// Метрики качества кода
 #[derive(Debug, Clone)]
@@ -155,36 +172,24 @@ impl QualityMetricsCalculator {
 
     fn count_functions(&self, content: &str, file_type: &FileType) -> u32 {
         match file_type {
-            FileType::Rust => {
-                let fn_pattern = Regex::new(r"fn\s+\w+").unwrap();
-                fn_pattern.find_iter(content).count() as u32
-            }
+            FileType::Rust => RUST_FN_RE.find_iter(content).count() as u32,
             FileType::JavaScript | FileType::TypeScript => {
-                let fn_pattern = Regex::new(r"function\s+\w+|const\s+\w+\s*=\s*\(").unwrap();
-                fn_pattern.find_iter(content).count() as u32
-            }
-            FileType::Python => {
-                let fn_pattern = Regex::new(r"def\s+\w+").unwrap();
-                fn_pattern.find_iter(content).count() as u32
+                JS_FN_RE.find_iter(content).count() as u32
             }
+            FileType::Python => PY_FN_RE.find_iter(content).count() as u32,
             _ => 0,
         }
     }
 
     fn count_documented_functions(&self, content: &str, file_type: &FileType) -> u32 {
         match file_type {
-            FileType::Rust => {
-                let doc_pattern = Regex::new(r"///.*\n\s*fn\s+\w+").unwrap();
-                doc_pattern.find_iter(content).count() as u32
-            }
+            FileType::Rust => RUST_DOC_FN_RE.find_iter(content).count() as u32,
             FileType::JavaScript | FileType::TypeScript => {
-                let doc_pattern = Regex::new(r"/\*\*.*?\*/\s*function\s+\w+").unwrap();
-                doc_pattern.find_iter(content).count() as u32
-            }
-            FileType::Python => {
-                let doc_pattern = Regex::new(r#"def\s+\w+[^:]*:\s*""".*?""""#).unwrap();
-                doc_pattern.find_iter(content).count() as u32
+                JS_DOC_FN_RE.find_iter(content).count() as u32
             }
+            // Без docstring'ов regex зря перебрал бы каждый def
+            FileType::Python if !content.contains("\"\"\"") => 0,
+            FileType::Python => PY_DOC_FN_RE.find_iter(content).count() as u32,
             _ => 0,
         }
     }
@@ -239,16 +244,14 @@ impl QualityMetricsCalculator {
         let mut debt_score = 0.0;
 
         // Технический долг от TODO/FIXME/HACK
-        let todo_pattern = Regex::new(r"(?i)(TODO|FIXME|HACK|XXX|BUG)").unwrap();
-        debt_score += todo_pattern.find_iter(content).count() as f32 * 0.1;
+        debt_score += TODO_RE.find_iter(content).count() as f32 * 0.1;
 
         // Технический долг от длинных строк
         let long_lines = content.lines().filter(|line| line.len() > 100).count() as f32;
         debt_score += long_lines * 0.05;
 
         // Технический долг от большого количества параметров
-        let long_param_pattern = Regex::new(r"fn\s+\w+\s*\([^)]{50,}\)").unwrap();
-        debt_score += long_param_pattern.find_iter(content).count() as f32 * 0.2;
+        debt_score += LONG_PARAM_LIST_RE.find_iter(content).count() as f32 * 0.2;
 
         // Технический долг от слишком сложных связей
         let complex_links = semantic_links
@@ -364,3 +367,48 @@ impl Default for QualityMetricsCalculator {
         Self::new()
     }
 }
+
+/// Есть ли в файле повторяющийся блок из 3 непустых строк, копии которого не перекрываются.
+/// Пустые строки и строки-комментарии (`//`, `#`) не учитываются. Один проход по окнам:
+/// каждое сравнивается только со своим первым вхождением — самым дальним из возможных.
+pub(crate) fn has_duplicated_block(content: &str) -> bool {
+    let lines: Vec<&str> = content
+        .lines()
+        .map(|line| line.trim())
+        .filter(|line| !line.is_empty() && !line.starts_with("//") && !line.starts_with("#"))
+        .collect();
+
+    let mut first_seen: HashMap<&[&str], usize> = HashMap::new();
+    for (start, block) in lines.windows(3).enumerate() {
+        let first = *first_seen.entry(block).or_insert(start);
+        if start >= first + 3 {
+            return true;
+        }
+    }
+
+    false
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn duplicated_block_detection() {
+        // Нет повторов
+        assert!(!has_duplicated_block("a\nb\nc\nd\ne\nf\ng"));
+        assert!(!has_duplicated_block(""));
+        // Две копии ровно через 3 строки, в том числе в самом конце файла
+        assert!(has_duplicated_block("a\nb\nc\na\nb\nc"));
+        assert!(has_duplicated_block("x\na\nb\nc\ny\nz\na\nb\nc\nw"));
+        // Перекрывающиеся копии не считаются дублированием
+        assert!(!has_duplicated_block("a\na\na\na"));
+        assert!(!has_duplicated_block("a\nb\na\nb\na"));
+        // ...но достаточно длинный повтор уже содержит неперекрывающиеся копии
+        assert!(has_duplicated_block("a\na\na\na\na\na"));
+        // Пустые строки, комментарии и отступы игнорируются
+        assert!(has_duplicated_block(
+            "a\n\n  b\n// note\nc\n# hdr\na\nb\n    c"
+        ));
+    }
+}
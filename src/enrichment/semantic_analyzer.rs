@@ -1,5 +1,6 @@
 // Advanced semantic analysis for code understanding
 use crate::enrichment::enricher_core::*;
+use crate::enrichment::quality_metrics::has_duplicated_block;
 use crate::types::*;
 use regex::Regex;
 use std::collections::HashMap;
@@ -509,7 +510,7 @@ impl SemanticEnricher {
         }
 
         // Duplicated code
-        if self.has_code_duplication(content) {
+        if has_duplicated_block(content) {
             smells.push(CodeSmell {
                 smell_type: CodeSmellType::DuplicatedCode,
                 severity: Priority::Medium,
@@ -627,7 +628,7 @@ impl SemanticEnricher {
         debt_score += (content.matches("HACK").count() * 4) as f32;
 
         // Code duplication
-        if self.has_code_duplication(content) {
+        if has_duplicated_block(content) {
             debt_score += 5.0;
         }
 
@@ -646,27 +647,6 @@ impl SemanticEnricher {
         // Normalize (0.0 - 1.0)
         (debt_score / 100.0).min(1.0)
     }
-
-    fn has_code_duplication(&self, content: &str) -> bool {
-        let lines: Vec<&str> = content
-            .lines()
-            .map(|line| line.trim())
-            .filter(|line| !line.is_empty() && !line.starts_with("//") && !line.starts_with("#"))
-            .collect();
-
-        // Simple check for repeating blocks of 3+ lines
-        for i in 0..lines.len().saturating_sub(3) {
-            let block = &lines[i..i + 3];
-            for j in (i + 3)..lines.len().saturating_sub(3) {
-                let other_block = &lines[j..j + 3];
-                if block == other_block {
-                    return true;
-                }
-            }
-        }
-
-        false
-    }
 }
 
 impl Default for SemanticEnricher {
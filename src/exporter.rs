@@ -822,10 +822,17 @@ impl Exporter {
     }
 
     fn escape_label(&self, text: &str) -> String {
+        // Нечего экранировать — одна копия вместо цепочки replace
+        if !text.contains(['"', '\n']) {
+            return text.to_string();
+        }
         text.replace("\"", "\\\"").replace("\n", "\\n")
     }
 
     fn escape_xml(&self, text: &str) -> String {
+        if !text.contains(['&', '<', '>', '"', '\'']) {
+            return text.to_string();
+        }
         text.replace("&", "&amp;")
             .replace("<", "&lt;")
             .replace(">", "&gt;")
@@ -2,8 +2,12 @@
 use crate::types::*;
 use regex::Regex;
 use std::collections::HashMap;
+use std::path::Path;
 use uuid::Uuid;
 
+/// Imports and exports of one source file, keyed by its path
+type FileSymbols<'a> = HashMap<&'a Path, Option<(Vec<String>, Vec<String>)>>;
+
 /// Analyzes relations between capsules
 pub struct RelationAnalyzer {
     import_patterns: HashMap<FileType, Vec<Regex>>,
@@ -130,6 +134,7 @@ impl RelationAnalyzer {
     /// Build advanced relations between capsules
     pub fn build_advanced_relations(&self, capsules: &[Capsule]) -> Result<Vec<CapsuleRelation>> {
         let mut relations = Vec::new();
+        let file_symbols = self.collect_file_symbols(capsules);
 
         for capsule in capsules {
             // Relations through dependencies
@@ -184,9 +189,9 @@ impl RelationAnalyzer {
             }
 
             // Relations through semantic analysis
-            if let Ok(content) = std::fs::read_to_string(&capsule.file_path) {
+            if let Some(Some((imports, _))) = file_symbols.get(capsule.file_path.as_path()) {
                 if let Some(semantic_relations) =
-                    self.analyze_semantic_relations(capsule, &content, capsules)
+                    self.analyze_semantic_relations(capsule, imports, capsules, &file_symbols)
                 {
                     relations.extend(semantic_relations);
                 }
@@ -196,6 +201,29 @@ impl RelationAnalyzer {
         Ok(relations)
     }
 
+    /// Read each capsule source file once and extract its imports and exports.
+    /// Capsules from the same file share one entry; unreadable files map to None.
+    fn collect_file_symbols<'a>(&self, capsules: &'a [Capsule]) -> FileSymbols<'a> {
+        let mut file_symbols = FileSymbols::new();
+
+        for capsule in capsules {
+            let path = capsule.file_path.as_path();
+            file_symbols.entry(path).or_insert_with(|| {
+                let content = std::fs::read_to_string(path).ok()?;
+                let file_type = self.determine_file_type(path);
+                let imports = self
+                    .extract_imports(&content, &file_type)
+                    .unwrap_or_default();
+                let exports = self
+                    .extract_exports(&content, &file_type)
+                    .unwrap_or_default();
+                Some((imports, exports))
+            });
+        }
+
+        file_symbols
+    }
+
     /// Calculate relation strength based on file structure
     fn calculate_file_relation_strength(
         &self,
@@ -243,33 +271,22 @@ impl RelationAnalyzer {
     fn analyze_semantic_relations(
         &self,
         capsule: &Capsule,
-        content: &str,
+        imports: &[String],
         all_capsules: &[Capsule],
+        file_symbols: &FileSymbols,
     ) -> Option<Vec<CapsuleRelation>> {
         let mut relations = Vec::new();
 
-        // Extract imports and exports
-        let file_type = self.determine_file_type(&capsule.file_path);
-        let imports = self
-            .extract_imports(content, &file_type)
-            .unwrap_or_default();
-        let _exports = self
-            .extract_exports(content, &file_type)
-            .unwrap_or_default();
-
         // Find matching capsules
         for other_capsule in all_capsules {
             if capsule.id == other_capsule.id {
                 continue;
             }
 
-            if let Ok(other_content) = std::fs::read_to_string(&other_capsule.file_path) {
-                let other_file_type = self.determine_file_type(&other_capsule.file_path);
-                let other_exports = self
-                    .extract_exports(&other_content, &other_file_type)
-                    .unwrap_or_default();
-
-                let strength = self.calculate_connection_strength(&imports, &other_exports);
+            if let Some(Some((_, other_exports))) =
+                file_symbols.get(other_capsule.file_path.as_path())
+            {
+                let strength = self.calculate_connection_strength(imports, other_exports);
                 if strength > self.relation_strength_threshold {
                     relations.push(CapsuleRelation {
                         from_id: capsule.id,
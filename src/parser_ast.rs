@@ -75,6 +75,8 @@ pub struct LanguagePatterns {
     pub constants: Regex,
     pub comments: Regex,
     pub complexity_indicators: Vec<Regex>,
+    /// Операторы-литералы: считаются подстрочным поиском, без regex
+    pub complexity_operators: Vec<&'static str>,
 }
 
 impl ParserAST {
@@ -115,9 +117,8 @@ impl ParserAST {
                 Regex::new(r"\bwhile\b")?,
                 Regex::new(r"\bmatch\b")?,
                 Regex::new(r"\bloop\b")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["&&", "||"],
         })
     }
 
@@ -147,10 +148,8 @@ impl ParserAST {
                 Regex::new(r"\bcase\b")?,
                 Regex::new(r"\btry\b")?,
                 Regex::new(r"\bcatch\b")?,
-                Regex::new(r"\?\?")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["??", "&&", "||"],
         })
     }
 
@@ -180,10 +179,8 @@ impl ParserAST {
                 Regex::new(r"\bcase\b")?,
                 Regex::new(r"\btry\b")?,
                 Regex::new(r"\bcatch\b")?,
-                Regex::new(r"\?\?")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["??", "&&", "||"],
         })
     }
 
@@ -212,6 +209,7 @@ impl ParserAST {
                 Regex::new(r"\bor\b")?,
                 Regex::new(r"\bnot\b")?,
             ],
+            complexity_operators: Vec::new(),
         })
     }
 
@@ -245,9 +243,8 @@ impl ParserAST {
                 Regex::new(r"\bcase\b")?,
                 Regex::new(r"\btry\b")?,
                 Regex::new(r"\bcatch\b")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["&&", "||"],
         })
     }
 
@@ -281,9 +278,8 @@ impl ParserAST {
                 Regex::new(r"\bcase\b")?,
                 Regex::new(r"\btry\b")?,
                 Regex::new(r"\bcatch\b")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["&&", "||"],
         })
     }
 
@@ -307,9 +303,8 @@ impl ParserAST {
                 Regex::new(r"\bswitch\b")?,
                 Regex::new(r"\bcase\b")?,
                 Regex::new(r"\bselect\b")?,
-                Regex::new(r"&&")?,
-                Regex::new(r"\|\|")?,
             ],
+            complexity_operators: vec!["&&", "||"],
         })
     }
 
@@ -634,6 +629,10 @@ impl ParserAST {
             complexity += indicator.find_iter(content).count() as u32;
         }
 
+        for operator in &patterns.complexity_operators {
+            complexity += content.matches(operator).count() as u32;
+        }
+
         // Добавляем сложность на основе других факторов
         let lines_count = content.lines().count() as u32;
         complexity += lines_count / 10; // Добавляем 1 за каждые 10 строк
@@ -650,13 +649,14 @@ impl ParserAST {
         let mut max_level = 0;
         let mut current_level: i32 = 0;
 
-        for ch in content.chars() {
-            match ch {
-                '{' | '(' | '[' => {
+        // Скобки — ASCII, поэтому байтовый проход эквивалентен посимвольному, но без декодирования UTF-8
+        for byte in content.bytes() {
+            match byte {
+                b'{' | b'(' | b'[' => {
                     current_level += 1;
                     max_level = max_level.max(current_level);
                 }
-                '}' | ')' | ']' => {
+                b'}' | b')' | b']' => {
                     current_level = current_level.saturating_sub(1);
                 }
                 _ => {}
@@ -1238,6 +1238,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             js_patterns: LanguagePatterns {
                 functions: Regex::new(r"function\s+(\w+)").unwrap(),
@@ -1256,6 +1257,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             ts_patterns: LanguagePatterns {
                 functions: Regex::new(r"function\s+(\w+)").unwrap(),
@@ -1274,6 +1276,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             python_patterns: LanguagePatterns {
                 functions: Regex::new(r"def\s+(\w+)").unwrap(),
@@ -1292,6 +1295,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             java_patterns: LanguagePatterns {
                 functions: Regex::new(r"(?:public|private|protected)?\s*\w+\s+(\w+)\s*\(").unwrap(),
@@ -1310,6 +1314,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             cpp_patterns: LanguagePatterns {
                 functions: Regex::new(r"\w+\s+(\w+)\s*\(").unwrap(),
@@ -1328,6 +1333,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bwhile\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             go_patterns: LanguagePatterns {
                 functions: Regex::new(r"func\s+(\w+)").unwrap(),
@@ -1346,6 +1352,7 @@ impl Default for ParserAST {
                     Regex::new(r"\bfor\b").unwrap(),
                     Regex::new(r"\bswitch\b").unwrap(),
                 ],
+                complexity_operators: Vec::new(),
             },
             pattern_cache: HashMap::new(),
         })